@@ -14,6 +14,7 @@ The agent is persistent and will be saved to Microsoft Foundry service.
 
 import asyncio
 import os
+import time
 from dotenv import load_dotenv
 
 from agent_framework import ChatAgent
@@ -28,6 +29,38 @@ PROJECT_ENDPOINT = os.getenv("PROJECT_ENDPOINT")
 MODEL_DEPLOYMENT = os.getenv("MODEL_DEPLOYMENT_NAME")
 
 
+class CachedAzureCliCredential(AzureCliCredential):
+    """AzureCliCredential that reuses a token until it is about to expire.
+
+    Both the project client and the agent client below ask for a token, so
+    without this cache the Azure CLI would be launched once per client.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._tokens = {}
+        self._lock = asyncio.Lock()
+
+    async def _cached(self, fetch, scopes, token_options, call_kwargs):
+        # Claims challenges must always get a fresh token
+        if token_options.get("claims"):
+            return await fetch(*scopes, **call_kwargs)
+        key = (fetch.__name__, tuple(sorted(scopes)), tuple(sorted(token_options.items())))
+        async with self._lock:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - time.time() < 300:
+                token = await fetch(*scopes, **call_kwargs)
+                self._tokens[key] = token
+            return token
+
+    async def get_token(self, *scopes, **kwargs):
+        return await self._cached(super().get_token, scopes, kwargs, kwargs)
+
+    async def get_token_info(self, *scopes, options=None):
+        # azure-core passes options={} for a plain request; treat it like None
+        return await self._cached(super().get_token_info, scopes, dict(options or {}), {"options": options})
+
+
 async def main():
     """Interactive demo: Create agent and chat."""
     
@@ -35,7 +68,7 @@ async def main():
     print("DEMO: Create Microsoft Foundry Agent (Interactive)")
     print("="*70)
     
-    async with AzureCliCredential() as credential:
+    async with CachedAzureCliCredential() as credential:
         # Create the agent in Azure AI Foundry
         async with AIProjectClient(
             endpoint=PROJECT_ENDPOINT,
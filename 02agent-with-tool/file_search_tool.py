@@ -30,6 +30,14 @@ MODEL_DEPLOYMENT = os.getenv("MODEL_DEPLOYMENT_NAME")
 # You can create a vector store in the Azure AI Foundry portal and upload files
 VECTOR_STORE_ID = os.getenv("VECTOR_STORE_ID", "assistant-1bXV9VQkG63EuptpBxZWP4")
 
+# Build the file search tool once; it only depends on the vector store ID
+FILE_SEARCH_TOOL = HostedFileSearchTool(
+    inputs=[
+        HostedVectorStoreContent(vector_store_id=VECTOR_STORE_ID)
+    ],
+    max_results=5
+)
+
 
 async def main():
     """Interactive demo: Agent with File Search Tool."""
@@ -58,17 +66,20 @@ async def main():
             ),
             instructions="You are a document search assistant. Use the file search tool to find information in uploaded documents.",
             name="FileSearchAgent",
-            tools=[
-                HostedFileSearchTool(
-                    inputs=[
-                        HostedVectorStoreContent(vector_store_id=VECTOR_STORE_ID)
-                    ],
-                    max_results=5
-                )
-            ]
+            tools=[FILE_SEARCH_TOOL]
         ) as agent
     ):
         print("\n Agent created with File Search Tool")
+        
+        # Warm up: the agent and its vector store are set up on the first run,
+        # so do that now instead of making the first question wait for it
+        print("⏳ Warming up the agent...")
+        try:
+            await agent.run("ready?", max_tokens=1)
+        except Exception as e:
+            # Not fatal, but usually points at a config problem worth seeing now
+            print(f"⚠️ Warmup skipped: {e}")
+        
         print("💡 TIP: Ask questions about documents in your vector store")
         
         print("\n" + "="*70)
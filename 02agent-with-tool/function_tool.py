@@ -10,8 +10,10 @@ This demo shows a calculator function tool.
 The agent can perform mathematical calculations.
 """
 
+import ast
 import asyncio
 import os
+from functools import lru_cache
 from typing import Annotated
 from pydantic import Field
 from dotenv import load_dotenv
@@ -27,25 +29,44 @@ API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-07-01-preview")
 
 
+# Only plain arithmetic on numbers and these functions is allowed
+ALLOWED_FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "pow": pow,
+}
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop,
+    ast.Constant, ast.Name, ast.Load, ast.Call, ast.keyword, ast.Starred,
+    ast.List, ast.Tuple,
+)
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Validate an expression against the whitelist and compile it once."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported value: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id not in ALLOWED_FUNCTIONS:
+            raise ValueError(f"Unknown name: {node.id}")
+    return compile(tree, "<calculator>", "eval")
+
+
 # Define calculator function
 def calculate(
     expression: Annotated[str, Field(description="Mathematical expression to evaluate, e.g. '2 + 2' or '10 * 5'")]
 ) -> str:
     """Evaluate a mathematical expression."""
     try:
-        # Safe evaluation with limited namespace
-        result = eval(
-            expression,
-            {"__builtins__": {}},
-            {
-                "abs": abs,
-                "round": round,
-                "min": min,
-                "max": max,
-                "sum": sum,
-                "pow": pow,
-            }
-        )
+        # Safe evaluation of a pre-validated, cached expression
+        result = eval(_compile_expression(expression), {"__builtins__": {}}, ALLOWED_FUNCTIONS)
         return f"Result: {result}"
     except Exception as e:
         return f"Error: Could not calculate '{expression}'"
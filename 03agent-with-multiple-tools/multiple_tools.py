@@ -14,13 +14,16 @@ This demo shows an agent with MULTIPLE tools:
 The agent automatically chooses the right tool based on your question.
 """
 
+import ast
 import asyncio
 import os
+import time
+from functools import lru_cache
 from typing import Annotated
 from pydantic import Field
 from dotenv import load_dotenv
-from datetime import datetime
-import requests
+from datetime import datetime, timedelta, timezone as dt_timezone
+import httpx
 
 from agent_framework.azure import AzureOpenAIChatClient
 
@@ -34,46 +37,106 @@ API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-07-01-preview")
 
 
 # Tool 1: Weather
+WEATHER_DATA = {
+    "london": "🌧️ 15°C, Rainy",
+    "paris": "☀️ 22°C, Sunny",
+    "tokyo": "⛅ 18°C, Partly Cloudy",
+    "new york": "🌤️ 20°C, Clear"
+}
+
+
 def get_weather(
     location: Annotated[str, Field(description="City name")]
 ) -> str:
     """Get current weather for a location."""
-    weather_data = {
-        "london": "🌧️ 15°C, Rainy",
-        "paris": "☀️ 22°C, Sunny",
-        "tokyo": "⛅ 18°C, Partly Cloudy",
-        "new york": "🌤️ 20°C, Clear"
-    }
-    return weather_data.get(location.lower(), f"Weather data not available for {location}")
+    return WEATHER_DATA.get(location.lower(), f"Weather data not available for {location}")
 
 
 # Tool 2: Calculator
+# Only plain arithmetic on numbers and these functions is allowed
+ALLOWED_FUNCTIONS = {
+    "abs": abs, "round": round, "min": min, "max": max, "pow": pow
+}
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop,
+    ast.Constant, ast.Name, ast.Load, ast.Call, ast.keyword, ast.Starred,
+    ast.List, ast.Tuple,
+)
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Validate an expression against the whitelist and compile it once."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported value: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id not in ALLOWED_FUNCTIONS:
+            raise ValueError(f"Unknown name: {node.id}")
+    return compile(tree, "<calculator>", "eval")
+
+
 def calculate(
     expression: Annotated[str, Field(description="Math expression")]
 ) -> str:
     """Calculate a mathematical expression."""
     try:
-        result = eval(expression, {"__builtins__": {}}, {
-            "abs": abs, "round": round, "min": min, "max": max, "pow": pow
-        })
+        result = eval(_compile_expression(expression), {"__builtins__": {}}, ALLOWED_FUNCTIONS)
         return f"Result: {result}"
     except:
         return f"Cannot calculate '{expression}'"
 
 
 # Tool 3: Time Zone
-def get_time(
+# One HTTP client for all tool calls, plus a short-lived cache of UTC offsets
+_HTTP: httpx.AsyncClient | None = None
+_OFFSET_CACHE: dict[str, tuple[float, timedelta]] = {}
+_OFFSET_TTL = 60  # seconds
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Create the shared HTTP client on first use so connections are kept alive."""
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = httpx.AsyncClient(
+            timeout=3.0,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=75)
+        )
+    return _HTTP
+
+
+async def _get_utc_offset(timezone: str) -> timedelta | None:
+    """Look up the UTC offset of a timezone, reusing recent answers."""
+    cached = _OFFSET_CACHE.get(timezone)
+    if cached and time.monotonic() - cached[0] < _OFFSET_TTL:
+        return cached[1]
+    
+    response = await _get_http().get(f"http://worldtimeapi.org/api/timezone/{timezone}")
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    
+    utc_offset = data.get('utc_offset', '+00:00')
+    hours, minutes = utc_offset[1:].split(':')
+    offset = timedelta(hours=int(hours), minutes=int(minutes))
+    if utc_offset.startswith('-'):
+        offset = -offset
+    _OFFSET_CACHE[timezone] = (time.monotonic(), offset)
+    return offset
+
+
+async def get_time(
     timezone: Annotated[str, Field(description="Timezone like 'America/New_York' or 'Europe/London'")]
 ) -> str:
     """Get current time in a timezone."""
     try:
-        response = requests.get(f"http://worldtimeapi.org/api/timezone/{timezone}", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            time = data.get('datetime', '').split('T')[1].split('.')[0]
-            return f"⏰ Current time in {timezone}: {time}"
-        else:
+        offset = await _get_utc_offset(timezone)
+        if offset is None:
             return f"Could not get time for {timezone}"
+        current = (datetime.now(dt_timezone.utc) + offset).strftime('%H:%M:%S')
+        return f"⏰ Current time in {timezone}: {current}"
     except:
         return f"Error getting time for {timezone}"
 
@@ -106,21 +169,26 @@ async def main():
     print("💬 Interactive Chat (Type 'quit' to exit)")
     print("="*70 + "\n")
     
-    while True:
-        user_input = input("You: ")
-        
-        if user_input.lower() in ['quit', 'exit', 'q']:
-            print("\n👋 Goodbye!")
-            break
-        
-        if not user_input.strip():
-            continue
-        
-        print("Agent: ", end="", flush=True)
-        async for chunk in agent.run_stream(user_input):
-            if chunk.text:
-                print(chunk.text, end="", flush=True)
-        print("\n")
+    try:
+        while True:
+            user_input = input("You: ")
+            
+            if user_input.lower() in ['quit', 'exit', 'q']:
+                print("\n👋 Goodbye!")
+                break
+            
+            if not user_input.strip():
+                continue
+            
+            print("Agent: ", end="", flush=True)
+            async for chunk in agent.run_stream(user_input):
+                if chunk.text:
+                    print(chunk.text, end="", flush=True)
+            print("\n")
+    finally:
+        # Close the shared time zone HTTP client however the chat ends
+        if _HTTP is not None:
+            await _HTTP.aclose()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ This uses a custom ApprovalRequiredTool wrapper (same pattern as file 11)
 """
 
 import asyncio
+import inspect
 import os
 from typing import Annotated, Callable
 from pydantic import Field
@@ -22,6 +23,12 @@ from pathlib import Path
 
 from agent_framework.azure import AzureOpenAIChatClient
 
+# Use orjson for parsing tool arguments when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # Load environment variables
 load_dotenv('.env')
 
@@ -31,9 +38,11 @@ DEPLOYMENT = os.getenv('AZURE_OPENAI_CHAT_DEPLOYMENT_NAME')
 API_KEY = os.getenv('AZURE_OPENAI_API_KEY')
 API_VERSION = os.getenv('AZURE_OPENAI_API_VERSION')
 
-# Create demo directory for file operations
+# Set ST_DEBUG=1 to print the wrapper's debug output
+DEBUG = bool(os.getenv('ST_DEBUG'))
+
+# Demo directory for file operations (created on the first create_file call)
 DEMO_DIR = Path(__file__).parent / "demo_files"
-DEMO_DIR.mkdir(exist_ok=True)
 
 
 # ============================================================================
@@ -48,6 +57,8 @@ class ApprovalRequiredTool:
         self.func_name = func.__name__
         self.description = description or func.__doc__ or "No description"
         self.approval_callback = None
+        # Parameter names never change, so look them up once here
+        self._param_names = tuple(inspect.signature(func).parameters)
     
     def set_approval_callback(self, callback: Callable):
         """Set the callback function that asks user for approval."""
@@ -56,7 +67,8 @@ class ApprovalRequiredTool:
     def __call__(self, *args, **kwargs):
         """Execute the function with approval check."""
         # Debug: show what we received
-        print(f"[DEBUG] Wrapper called with args={args}, kwargs={kwargs}")
+        if DEBUG:
+            print(f"[DEBUG] Wrapper called with args={args}, kwargs={kwargs}")
         
         # Handle nested argument structure from agent framework
         # The framework may pass: kwargs={'args': 'value', 'kwargs': '{}'}
@@ -65,14 +77,14 @@ class ApprovalRequiredTool:
             nested_args = kwargs.get('args', '')
             nested_kwargs_str = kwargs.get('kwargs', '{}')
             
-            print(f"[DEBUG] Detected nested structure - unwrapping...")
-            print(f"[DEBUG] nested_args={nested_args}, nested_kwargs={nested_kwargs_str}")
+            if DEBUG:
+                print(f"[DEBUG] Detected nested structure - unwrapping...")
+                print(f"[DEBUG] nested_args={nested_args}, nested_kwargs={nested_kwargs_str}")
             
             # Convert nested_kwargs string to dict if needed
-            import json
             if isinstance(nested_kwargs_str, str) and nested_kwargs_str:
                 try:
-                    nested_kwargs = json.loads(nested_kwargs_str) if nested_kwargs_str.strip() else {}
+                    nested_kwargs = json_loads(nested_kwargs_str) if not nested_kwargs_str.isspace() else {}
                 except:
                     nested_kwargs = {}
             else:
@@ -80,9 +92,7 @@ class ApprovalRequiredTool:
             
             # Map 'args' to the actual parameter name
             # For delete_file_impl, the parameter is 'filename'
-            import inspect
-            sig = inspect.signature(self.original_func)
-            param_names = list(sig.parameters.keys())
+            param_names = self._param_names
             
             if param_names and nested_args:
                 # Use the first parameter name
@@ -91,28 +101,25 @@ class ApprovalRequiredTool:
             else:
                 actual_kwargs = nested_kwargs
             
-            print(f"[DEBUG] Unwrapped to: {actual_kwargs}")
+            if DEBUG:
+                print(f"[DEBUG] Unwrapped to: {actual_kwargs}")
             
-            # Prepare approval request info
-            approval_info = {
-                "function_name": self.func_name,
-                "description": self.description,
-                "arguments": {
-                    "args": (),
-                    "kwargs": actual_kwargs
-                }
-            }
-        else:
-            # Normal call - no unwrapping needed
-            actual_kwargs = kwargs
-            approval_info = {
-                "function_name": self.func_name,
-                "description": self.description,
-                "arguments": {
-                    "args": args,
-                    "kwargs": kwargs
-                }
+            # Call with the unwrapped keyword arguments only
+            args, kwargs = (), actual_kwargs
+        
+        return self._approve_and_call(args, kwargs)
+    
+    def _approve_and_call(self, args: tuple, kwargs: dict):
+        """Ask for approval, then run the wrapped function with the resolved arguments."""
+        # Prepare approval request info
+        approval_info = {
+            "function_name": self.func_name,
+            "description": self.description,
+            "arguments": {
+                "args": args,
+                "kwargs": kwargs
             }
+        }
         
         # Ask for approval
         if self.approval_callback:
@@ -125,19 +132,16 @@ class ApprovalRequiredTool:
         if approved:
             print(f"✅ APPROVED: Executing {self.func_name}")
             try:
-                if 'args' in kwargs and 'kwargs' in kwargs:
-                    # Use unwrapped arguments
-                    result = self.original_func(**actual_kwargs)
-                else:
-                    # Use original arguments
-                    result = self.original_func(*args, **kwargs)
-                print(f"[DEBUG] Function returned: {result}")
+                result = self.original_func(*args, **kwargs)
+                if DEBUG:
+                    print(f"[DEBUG] Function returned: {result}")
                 return result
             except Exception as e:
-                import traceback
                 error_msg = f"❌ Error executing {self.func_name}: {e}"
-                print(f"[DEBUG] {error_msg}")
-                print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+                if DEBUG:
+                    import traceback
+                    print(f"[DEBUG] {error_msg}")
+                    print(f"[DEBUG] Traceback: {traceback.format_exc()}")
                 return error_msg
         else:
             print(f"❌ REJECTED: Not executing {self.func_name}")
@@ -154,6 +158,7 @@ def create_file(
 ) -> str:
     """Create a new file with content. Safe operation - no approval needed."""
     try:
+        DEMO_DIR.mkdir(parents=True, exist_ok=True)
         file_path = DEMO_DIR / filename
         file_path.write_text(content, encoding='utf-8')
         return f"✅ File '{filename}' created successfully with {len(content)} characters"
@@ -170,22 +175,25 @@ def delete_file_impl(
 ) -> str:
     """Delete a file. This function will be wrapped with approval requirement."""
     try:
-        # Debug: show what we received
-        print(f"[DEBUG] delete_file_impl called with filename='{filename}' (type: {type(filename)})")
-        
         file_path = DEMO_DIR / filename
-        print(f"[DEBUG] File path: {file_path}")
-        print(f"[DEBUG] File exists: {file_path.exists()}")
         
-        if file_path.exists():
+        # Debug: show what we received
+        if DEBUG:
+            print(f"[DEBUG] delete_file_impl called with filename='{filename}' (type: {type(filename)})")
+            print(f"[DEBUG] File path: {file_path}")
+            print(f"[DEBUG] File exists: {file_path.exists()}")
+        
+        # Try the delete directly instead of checking exists() first
+        try:
             file_path.unlink()
-            return f"🗑️ File '{filename}' deleted successfully"
-        else:
+        except FileNotFoundError:
             return f"⚠️ File '{filename}' not found in {DEMO_DIR}"
+        return f"🗑️ File '{filename}' deleted successfully"
     except Exception as e:
-        import traceback
-        print(f"[DEBUG] Exception: {e}")
-        print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+        if DEBUG:
+            import traceback
+            print(f"[DEBUG] Exception: {e}")
+            print(f"[DEBUG] Traceback: {traceback.format_exc()}")
         return f"❌ Error deleting file: {e}"
 
 
@@ -287,7 +295,8 @@ Rules:
         
         # Stream the response
         async for chunk in agent.run_stream(user_input):
-            print(chunk, end="", flush=True)
+            if chunk.text:
+                print(chunk.text, end="", flush=True)
         
         print()  # New line after response
 